@@ -0,0 +1,120 @@
+"""
+Cache semantica para los resumenes del LLM:
+- Embebe (objetivo, inicio del contenido) con text-embedding-3-small.
+- Busca el vecino mas cercano por coseno sobre una matriz numpy en memoria.
+- Devuelve el resumen guardado si la similitud supera el umbral.
+
+Complementa la cache exacta por hash de serp_scraper: captura objetivos
+redactados de forma ligeramente distinta sobre la misma SERP.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from openai import OpenAI
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+SIMILARITY_THRESHOLD = 0.92
+CONTENT_PREFIX_CHARS = 2000
+
+CACHE_PATH = Path.home() / ".cache" / "serp_scraper" / "semantic_cache.jsonl"
+
+# El modo batch llama a lookup/store desde varios hilos trabajadores
+# (asyncio.to_thread); todo el estado del modulo se muta bajo este lock.
+_LOCK = threading.Lock()
+
+_vectors: Optional[np.ndarray] = None
+_summaries: list[str] = []
+_timestamps: list[float] = []
+
+_CLIENT: Optional[OpenAI] = None
+
+# Memoiza el ultimo embedding: store() se llama justo despues de un
+# lookup() fallido con el mismo par y no debe pagar una segunda llamada.
+_last_embedding: Optional[tuple[str, np.ndarray]] = None
+
+
+def _client() -> OpenAI:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = OpenAI()
+    return _CLIENT
+
+
+def _embed(objective: str, content: str) -> np.ndarray:
+    global _last_embedding
+    text = objective + "\n" + content[:CONTENT_PREFIX_CHARS]
+    if _last_embedding is not None and _last_embedding[0] == text:
+        return _last_embedding[1]
+    response = _client().embeddings.create(model=EMBEDDING_MODEL, input=[text])
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    vector /= np.linalg.norm(vector)
+    _last_embedding = (text, vector)
+    return vector
+
+
+def _load() -> None:
+    global _vectors
+    if _vectors is not None:
+        return
+    rows: list[np.ndarray] = []
+    if CACHE_PATH.exists():
+        for line in CACHE_PATH.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            rows.append(np.asarray(entry["vector"], dtype=np.float32))
+            _summaries.append(entry["summary"])
+            _timestamps.append(entry.get("ts", 0.0))
+    _vectors = np.vstack(rows) if rows else np.empty((0, 0), dtype=np.float32)
+
+
+def lookup(
+    objective: str,
+    content: str,
+    ttl: Optional[float] = None,
+) -> Optional[str]:
+    with _LOCK:
+        _load()
+        assert _vectors is not None
+        if _vectors.size == 0:
+            return None
+        query = _embed(objective, content)
+        scores = np.dot(_vectors, query)
+        if ttl is not None:
+            # Descarta entradas caducadas: sin esto la capa semantica
+            # re-serviria (a similitud 1.0) lo que la cache exacta expiro.
+            ages = time.time() - np.asarray(_timestamps, dtype=np.float64)
+            scores = np.where(ages <= ttl, scores, -1.0)
+        best = int(np.argmax(scores))
+        if scores[best] >= SIMILARITY_THRESHOLD:
+            return _summaries[best]
+        return None
+
+
+def store(objective: str, content: str, summary: str) -> None:
+    global _vectors
+    with _LOCK:
+        _load()
+        vector = _embed(objective, content)
+        timestamp = time.time()
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with CACHE_PATH.open("a", encoding="utf-8") as handle:
+            handle.write(
+                json.dumps(
+                    {"vector": vector.tolist(), "summary": summary, "ts": timestamp}
+                )
+                + "\n"
+            )
+        if _vectors is None or _vectors.size == 0:
+            _vectors = vector[np.newaxis, :]
+        else:
+            _vectors = np.vstack([_vectors, vector])
+        _summaries.append(summary)
+        _timestamps.append(timestamp)
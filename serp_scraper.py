@@ -12,31 +12,153 @@ Requisitos previos:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import atexit
+import hashlib
+import os
+import re
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Union
+from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import httpx
+from lxml import etree
+from openai import AsyncOpenAI
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+import semantic_cache
+
 DEFAULT_TIMEOUT = 15
 DEFAULT_MODEL = "gpt-5-mini"
 
-CONSENT_SELECTORS: Iterable[tuple[str, str]] = [
-    (By.ID, "L2AGLb"),
-    (By.CSS_SELECTOR, "button[aria-label='Aceptar todo']"),
-    (By.CSS_SELECTOR, "button[aria-label='Aceptarlo todo']"),
-    (By.XPATH, "//button/span[contains(., 'Acepto')]"),
-    (By.XPATH, "//button[contains(., 'Aceptar todo')]"),
+CACHE_DIR = Path.home() / ".cache" / "serp_scraper"
+
+# Los dos bloques siguientes deben mantenerse byte a byte identicos entre
+# llamadas: OpenAI Responses cachea automaticamente el prefijo del prompt
+# (con descuento de tokens de entrada y menor TTFT) y cualquier
+# interpolacion lo invalidaria. Solo el contenido de la SERP varia al final.
+SYSTEM_PROMPT = (
+    "Eres un resumidor y organizador de informacion RAW. "
+    "Segun el objetivo de la busqueda, organiza los hallazgos "
+    "en bullets o tablas y resalta cifras, URLs y datos accionables."
+)
+
+# El preambulo es deliberadamente extenso: el prefijo comun debe superar
+# el minimo de ~1024 tokens a partir del cual OpenAI activa la cache de
+# prefijos; por debajo de ese umbral no hay hit posible.
+STABLE_PREAMBLE = (
+    "Instrucciones fijas para procesar la SERP.\n\n"
+    "Alcance y seleccion de informacion:\n"
+    "1. Lee el objetivo de la busqueda y quedate solo con la informacion "
+    "del texto que contribuya directamente a ese objetivo; descarta todo "
+    "lo demas aunque parezca interesante por si mismo.\n"
+    "2. Ignora navegacion, avisos de cookies, enlaces de paginacion, "
+    "botones de la interfaz, textos legales repetidos y cualquier otro "
+    "elemento propio de la interfaz de Google que no aporte contenido.\n"
+    "3. Distingue resultados organicos de anuncios cuando el texto lo "
+    "permita (etiquetas como 'Anuncio', 'Patrocinado' o similares) y "
+    "marca los anuncios como tales en el resumen.\n"
+    "4. Trata los fragmentos destacados, paneles de conocimiento, mapas "
+    "y listados de 'la gente tambien pregunta' como fuentes validas, "
+    "pero indica de que tipo de bloque procede el dato si es relevante "
+    "para valorar su fiabilidad.\n\n"
+    "Organizacion de los hallazgos:\n"
+    "5. Agrupa los hallazgos por entidad (negocio, producto, lugar, "
+    "persona o articulo) y no mezcles datos de entidades distintas en "
+    "una misma linea; si dos entidades comparten nombre, desambigua con "
+    "la direccion, el dominio o cualquier otro dato disponible.\n"
+    "6. Dentro de cada entidad, ordena los datos de mas a menos "
+    "accionables: primero lo que permite actuar (contacto, precio, "
+    "disponibilidad), despues lo descriptivo y por ultimo lo anecdotico.\n"
+    "7. Usa bullets para listados heterogeneos y tablas cuando todas "
+    "las entidades comparten los mismos campos; no combines ambos "
+    "formatos para el mismo grupo de entidades.\n"
+    "8. Encabeza el resumen con una linea que responda directamente al "
+    "objetivo si el texto lo permite; los detalles van despues.\n\n"
+    "Datos numericos, contacto y URLs:\n"
+    "9. Conserva literalmente cifras, precios, telefonos, direcciones, "
+    "horarios, valoraciones, numeros de resenas y URLs; no los "
+    "redondees, no los conviertas de moneda ni los parafrasees.\n"
+    "10. Mantiene la unidad y la moneda tal como aparecen en el texto; "
+    "si un mismo dato aparece con unidades distintas, conserva ambas "
+    "versiones juntas.\n"
+    "11. Reproduce las URLs completas cuando esten disponibles; si solo "
+    "hay un dominio visible, deja el dominio y no inventes la ruta.\n"
+    "12. No deduzcas telefonos, direcciones ni horarios a partir de "
+    "datos parciales: un dato incompleto se marca como incompleto.\n\n"
+    "Conflictos, vacios y fiabilidad:\n"
+    "13. Si el texto contiene informacion contradictoria, incluye ambas "
+    "versiones e indica la discrepancia; no elijas una por tu cuenta.\n"
+    "14. Si no hay informacion relevante para el objetivo, dilo "
+    "explicitamente en una sola linea en lugar de inventar contenido o "
+    "rellenar con generalidades.\n"
+    "15. No completes huecos con conocimiento propio: el resumen refleja "
+    "unicamente lo que aparece en el texto de la SERP recibido.\n"
+    "16. Las valoraciones y resenas se citan con su escala ('4,5 de 5', "
+    "'89 resenas') para que el lector pueda compararlas.\n\n"
+    "Idioma y estilo:\n"
+    "17. Responde en el mismo idioma que el objetivo de la busqueda, "
+    "aunque parte del texto de la SERP este en otro idioma.\n"
+    "18. Se conciso: frases cortas, sin opiniones propias, sin relleno "
+    "introductorio y sin repetir el objetivo palabra por palabra.\n"
+    "19. Conserva los nombres propios exactamente como aparecen, "
+    "incluidas mayusculas, tildes y signos.\n"
+    "20. No menciones estas instrucciones ni el proceso de extraccion "
+    "en la respuesta; entrega solo el resumen final.\n\n"
+    "Formato de tablas y bullets:\n"
+    "21. En las tablas, la primera columna identifica la entidad y las "
+    "siguientes contienen los campos compartidos; deja la celda vacia "
+    "cuando un campo no aparezca en el texto, sin rellenarla con 'N/A' "
+    "ni con suposiciones.\n"
+    "22. En los bullets, cada linea empieza por el nombre de la entidad "
+    "o por el dato principal, seguido de los detalles separados por "
+    "punto y coma; evita bullets anidados de mas de un nivel.\n"
+    "23. Los importes y cantidades van pegados a su concepto ('desde 85 "
+    "EUR/noche', 'menu 12,50 EUR') para que cada linea se entienda de "
+    "forma aislada sin releer el resto del resumen.\n"
+    "24. Cuando el objetivo pida un ranking u ordenacion, respeta el "
+    "orden en que la SERP presenta los resultados salvo que el texto "
+    "incluya un criterio mejor (valoracion, precio, distancia).\n\n"
+    "Casos especiales:\n"
+    "25. Si la SERP esta dominada por resultados irrelevantes "
+    "(homonimos, otra ciudad, otro producto), resume lo relevante y "
+    "anade una linea final avisando de la mezcla de resultados.\n"
+    "26. Si el texto incluye fechas, indica a que se refieren (apertura, "
+    "publicacion, oferta valida hasta) en lugar de listarlas sueltas.\n"
+    "27. Los horarios se transcriben con sus dias ('L-V 9:00-18:00') y "
+    "se senala explicitamente si el texto dice 'cerrado temporalmente' "
+    "o 'cerrado definitivamente'.\n"
+    "28. Ante fragmentos truncados por puntos suspensivos, usa solo la "
+    "parte visible y no completes la frase por contexto.\n\n"
+    "Objetivo de la busqueda: "
+)
+
+HTTP_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+
+CONSENT_CSS = (
+    "#L2AGLb, "
+    "button[aria-label='Aceptar todo'], "
+    "button[aria-label='Aceptarlo todo']"
+)
+CONSENT_XPATHS: Iterable[str] = [
+    "//button/span[contains(., 'Acepto')]",
+    "//button[contains(., 'Aceptar todo')]",
 ]
 
 
@@ -49,92 +171,278 @@ def build_driver(headless: bool = True) -> webdriver.Chrome:
     options.add_argument("--disable-gpu")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--window-size=1280,1024")
+    # Solo interesa el texto de page_source: bloquear imagenes, CSS y
+    # fuentes reduce los bytes transferidos y adelanta el retorno de get().
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option(
+        "prefs",
+        {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        },
+    )
+    options.page_load_strategy = "eager"
     service = Service()
     return webdriver.Chrome(service=service, options=options)
 
 
-def dismiss_consent(driver: webdriver.Chrome, timeout: int) -> None:
-    wait = WebDriverWait(driver, timeout)
-    for by, selector in CONSENT_SELECTORS:
+class DriverPool:
+    """Reutiliza instancias de Chrome entre consultas.
+
+    Arrancar Chromium cuesta 1-3 segundos; mantener drivers calientes
+    (V8 y pool de conexiones incluidos) lo amortiza en modo batch.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[bool, list[webdriver.Chrome]] = {}
+
+    def acquire(self, headless: bool = True) -> webdriver.Chrome:
+        with self._lock:
+            drivers = self._idle.get(headless)
+            if drivers:
+                return drivers.pop()
+        return build_driver(headless=headless)
+
+    def release(self, driver: webdriver.Chrome, headless: bool = True) -> None:
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        except Exception:
+            driver.quit()
+            return
+        with self._lock:
+            self._idle.setdefault(headless, []).append(driver)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            drivers = [d for group in self._idle.values() for d in group]
+            self._idle.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+_DRIVER_POOL = DriverPool()
+atexit.register(_DRIVER_POOL.shutdown)
+
+
+def dismiss_consent(driver: webdriver.Chrome, timeout: int = 2) -> None:
+    # Un unico selector CSS agrupado: el peor caso sin banner pasa de
+    # esperar timeout por selector a un solo sondeo corto.
+    try:
+        WebDriverWait(driver, min(timeout, 2)).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, CONSENT_CSS))
+        )
+    except TimeoutException:
+        pass
+    candidates = driver.find_elements(By.CSS_SELECTOR, CONSENT_CSS)
+    if not candidates:
+        for xpath in CONSENT_XPATHS:
+            candidates = driver.find_elements(By.XPATH, xpath)
+            if candidates:
+                break
+    for button in candidates:
         try:
-            button = wait.until(EC.element_to_be_clickable((by, selector)))
             button.click()
             return
-        except TimeoutException:
-            continue
         except Exception:
             continue
 
 
-def wait_for_condition(
-    driver: webdriver.Chrome,
-    predicate,
-    timeout: float = 10,
-    poll_frequency: float = 0.5,
-) -> None:
-    end_time = time.monotonic() + timeout
-    while time.monotonic() < end_time:
-        try:
-            if predicate(driver):
-                return
-        except Exception:
-            pass
-        time.sleep(poll_frequency)
-    raise TimeoutException(f"Timed out after {timeout} seconds.")
+SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "svg"})
+_PARSE_CHUNK_SIZE = 32 * 1024
+
+# Colapsa saltos de linea consecutivos y el espacio horizontal que los
+# rodea en una sola pasada C, en lugar de splitlines + strip por linea.
+_WS_RE = re.compile(r"[ \t]*\n[ \t]*(?:\n[ \t]*)*")
 
 
-def page_loaded(driver: webdriver.Chrome, timeout: int = 10) -> bool:
+def extract_text_from_html(
+    html: Union[str, bytes],
+    encoding: Optional[str] = None,
+) -> str:
+    # Acepta bytes directamente: lxml decodifica sin una copia unicode
+    # previa en Python. `encoding` transmite el charset de la cabecera
+    # HTTP; sin el, las paginas sin <meta charset> caerian en el
+    # latin-1 por defecto de libxml2 y el texto no ASCII saldria roto.
+    if not html:
+        return ""
+    parser = etree.HTMLPullParser(
+        events=("start", "end", "comment", "pi"),
+        recover=True,
+        encoding=encoding if isinstance(html, bytes) else None,
+    )
+    parts: list[str] = []
+    slots: dict[object, int] = {}
+    # Elementos cuyo tail puede seguir a medio parsear: en un evento end
+    # que cae justo en un limite de chunk, elem.tail aun es None aunque
+    # el documento tenga texto detras. Solo un evento posterior (o el
+    # cierre del parser) garantiza que el tail esta completo.
+    pending: list[tuple[object, Optional[int]]] = []
+    skip_depth = 0
+
+    def flush_pending() -> None:
+        while pending:
+            elem, slot = pending.pop()
+            if slot is not None and elem.tail:
+                parts[slot] = elem.tail
+            elem.clear()
+
+    def handle(event: str, elem) -> None:
+        nonlocal skip_depth
+        flush_pending()
+        if event in ("comment", "pi"):
+            # El cuerpo de un comentario o PI nunca es visible, pero su
+            # tail si: las SERP usan comentarios tipo <!--m--> como
+            # delimitadores y el texto que los sigue debe conservarse.
+            if skip_depth == 0:
+                pending.append((elem, len(parts)))
+                parts.append("")
+            else:
+                elem.clear()
+            return
+        is_element = isinstance(elem.tag, str)
+        is_skip_root = is_element and elem.tag in SKIP_TAGS
+        if event == "start":
+            if is_skip_root:
+                skip_depth += 1
+            elif is_element and skip_depth == 0:
+                # Reserva la posicion del texto del elemento ahora: su
+                # evento end llega despues que el de sus hijos y un
+                # append tardio romperia el orden del documento.
+                slots[elem] = len(parts)
+                parts.append("")
+            return
+        if is_skip_root:
+            skip_depth -= 1
+        slot = slots.pop(elem, None)
+        # skip_depth > 0 significa subtree de un tag a ignorar: ni el
+        # texto ni los tails de sus descendientes son visibles.
+        if skip_depth == 0:
+            if slot is not None and elem.text:
+                parts[slot] = elem.text
+            pending.append((elem, len(parts)))
+            parts.append("")
+        else:
+            elem.clear()
+
+    for offset in range(0, len(html), _PARSE_CHUNK_SIZE):
+        parser.feed(html[offset : offset + _PARSE_CHUNK_SIZE])
+        for event, elem in parser.read_events():
+            handle(event, elem)
     try:
-        wait_for_condition(
-            driver,
-            lambda d: d.execute_script("return document.readyState") == "complete",
-            timeout=timeout,
-        )
-        return True
-    except TimeoutException:
-        return False
+        parser.close()
+    except etree.XMLSyntaxError:
+        # Documento sin ningun elemento (p. ej. solo espacios).
+        return ""
+    # close() genera los eventos end de los elementos aun abiertos al
+    # final del documento (recover=True); hay que drenarlos tambien.
+    for event, elem in parser.read_events():
+        handle(event, elem)
+    flush_pending()
+    return _WS_RE.sub("\n", "\n".join(parts).strip())
+
+
+_CLIENT: Optional[AsyncOpenAI] = None
 
 
-def extract_text_from_html(html: str) -> str:
-    soup = BeautifulSoup(html, "lxml")
-    for tag in soup(["script", "style", "noscript", "template", "svg"]):
-        tag.decompose()
-    text = soup.get_text(separator="\n", strip=True)
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    return "\n".join(lines)
+def _client() -> AsyncOpenAI:
+    """Cliente OpenAI compartido: reutiliza el pool de conexiones httpx."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AsyncOpenAI(http_client=httpx.AsyncClient(http2=True))
+    return _CLIENT
 
 
-def summarize_text_with_llm(
+def _emit(text: str) -> None:
+    """Escribe texto del resumen en stdout segun llega (modo --stream)."""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _summary_cache_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.txt"
+
+
+def _compress_serp(text: str, max_chars: int = 12000) -> str:
+    """Reduce el texto de la SERP antes de enviarlo al LLM.
+
+    Deduplica lineas repetidas (navegacion, pies de resultado), descarta
+    lineas demasiado cortas para aportar informacion y trunca al
+    presupuesto de caracteres: menos tokens de entrada, menos latencia.
+    """
+    seen: set[str] = set()
+    kept: list[str] = []
+    total = 0
+    for line in text.splitlines():
+        if len(line) < 3 or line in seen:
+            continue
+        seen.add(line)
+        kept.append(line)
+        total += len(line) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(kept)[:max_chars]
+
+
+async def summarize_text_with_llm(
     content: str,
     objective: str,
     *,
     model: str = DEFAULT_MODEL,
     temperature: float = 0.2,
     max_output_tokens: int = 800,
+    use_cache: bool = True,
+    cache_ttl: Optional[float] = None,
+    max_input_chars: int = 12000,
+    stream: bool = False,
 ) -> str:
-    client = OpenAI()
-    prompt = (
-        f"Objetivo de la busqueda: {objective.strip()}\n\n"
-        "Informacion depurada de la SERP:\n"
+    content = _compress_serp(content, max_input_chars)
+    cache_key = hashlib.blake2b(
+        repr((model, temperature, max_output_tokens, objective, content)).encode()
+    ).hexdigest()
+    cache_path = _summary_cache_path(cache_key)
+    if use_cache and cache_path.exists():
+        if cache_ttl is None or time.time() - cache_path.stat().st_mtime <= cache_ttl:
+            result = cache_path.read_text(encoding="utf-8")
+            if stream:
+                _emit(result)
+            return result
+
+    if use_cache:
+        cached = await asyncio.to_thread(
+            semantic_cache.lookup, objective, content, cache_ttl
+        )
+        if cached is not None:
+            if stream:
+                _emit(cached)
+            return cached
+
+    client = _client()
+    serp_block = (
+        "\n\nInformacion depurada de la SERP:\n"
         f"{content.strip() or '[Sin texto procesable]'}"
     )
 
-    response = client.responses.create(
+    request_kwargs = dict(
         model=model,
         temperature=temperature,
         max_output_tokens=max_output_tokens,
         reasoning={"effort": "medium", "summary": "auto"},
+        user=hashlib.sha256(
+            os.environ.get("OPENAI_API_KEY", "").encode()
+        ).hexdigest(),
         input=[
             {
                 "role": "system",
                 "content": [
                     {
                         "type": "input_text",
-                        "text": (
-                            "Eres un resumidor y organizador de informacion RAW. "
-                            "Segun el objetivo de la busqueda, organiza los hallazgos "
-                            "en bullets o tablas y resalta cifras, URLs y datos accionables."
-                        ),
+                        "text": SYSTEM_PROMPT,
                     }
                 ],
             },
@@ -143,32 +451,74 @@ def summarize_text_with_llm(
                 "content": [
                     {
                         "type": "input_text",
-                        "text": prompt,
-                    }
+                        "text": STABLE_PREAMBLE + objective.strip(),
+                    },
+                    {
+                        "type": "input_text",
+                        "text": serp_block,
+                    },
                 ],
             },
         ],
     )
 
-    output_text = getattr(response, "output_text", None)
-    if output_text:
-        return output_text.strip()
-
-    texts: list[str] = []
-    for block in getattr(response, "output", []):
-        if getattr(block, "type", None) == "message":
-            for piece in getattr(block, "content", []):
-                if getattr(piece, "type", None) == "text":
-                    texts.append(piece.text)
-        elif getattr(block, "type", None) == "output_text":
-            content = getattr(block, "content", None)
-            if isinstance(content, str):
-                texts.append(content)
+    if stream:
+        pieces: list[str] = []
+        async with client.responses.stream(**request_kwargs) as response_stream:
+            async for event in response_stream:
+                if event.type == "response.output_text.delta":
+                    _emit(event.delta)
+                    pieces.append(event.delta)
+        result = "".join(pieces).strip()
+        if not result:
+            raise RuntimeError("La API de OpenAI no devolvio texto procesable.")
+    else:
+        response = await client.responses.create(**request_kwargs)
 
-    cleaned = "\n\n".join(segment.strip() for segment in texts if segment.strip())
-    if not cleaned:
-        raise RuntimeError("La API de OpenAI no devolvio texto procesable.")
-    return cleaned
+        output_text = getattr(response, "output_text", None)
+        if output_text:
+            result = output_text.strip()
+        else:
+            # El SDK devuelve objetos tipados: un acceso directo con
+            # try/except sustituye al sondeo getattr campo a campo.
+            try:
+                texts = [
+                    piece.text
+                    for block in response.output
+                    if block.type == "message"
+                    for piece in block.content
+                    if piece.type == "text"
+                ]
+            except (AttributeError, TypeError):
+                texts = []
+
+            result = "\n\n".join(
+                segment.strip() for segment in texts if segment.strip()
+            )
+            if not result:
+                raise RuntimeError("La API de OpenAI no devolvio texto procesable.")
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(result, encoding="utf-8")
+        await asyncio.to_thread(semantic_cache.store, objective, content, result)
+    return result
+
+
+def _page_html(driver: webdriver.Chrome) -> str:
+    """Obtiene el HTML del documento via CDP, con page_source de respaldo.
+
+    DOM.getOuterHTML devuelve el documento directamente desde Chrome sin
+    la re-serializacion JSON del DOM que hace driver.page_source.
+    """
+    try:
+        root = driver.execute_cdp_cmd("DOM.getDocument", {"depth": -1})
+        node_id = root["root"]["nodeId"]
+        return driver.execute_cdp_cmd("DOM.getOuterHTML", {"nodeId": node_id})[
+            "outerHTML"
+        ]
+    except Exception:
+        return driver.page_source
 
 
 def fetch_google_serp_html(
@@ -176,25 +526,63 @@ def fetch_google_serp_html(
     *,
     headless: bool = True,
     timeout: int = DEFAULT_TIMEOUT,
+    pool: Optional[DriverPool] = None,
 ) -> str:
-    driver = build_driver(headless=headless)
+    if pool is not None:
+        driver = pool.acquire(headless=headless)
+    else:
+        driver = build_driver(headless=headless)
     try:
-        driver.get("https://www.google.com/?hl=es")
-        page_loaded(driver)
-        dismiss_consent(driver, timeout=5)
-
-        wait = WebDriverWait(driver, timeout)
-        search_box = wait.until(
-            EC.presence_of_element_located((By.XPATH, '//*[@id="APjFqb"]'))
+        # Visita minima al dominio para poder fijar la cookie de
+        # consentimiento y saltar el banner y el tecleo en el buscador.
+        driver.get("https://www.google.com/")
+        driver.add_cookie(
+            {"name": "CONSENT", "value": "YES+cb", "domain": ".google.com"}
+        )
+        driver.get(
+            f"https://www.google.com/search?q={quote_plus(query)}&hl=es&gl=es"
         )
-        search_box.clear()
-        search_box.send_keys(query)
-        search_box.send_keys(Keys.ENTER)
+        # La cookie pre-sembrada no siempre suprime el banner de
+        # consentimiento; si aparece igualmente, aceptarlo antes de
+        # esperar a que la SERP termine de cargar.
+        dismiss_consent(driver, timeout=1)
 
-        page_loaded(driver)
-        return driver.page_source
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return _page_html(driver)
     finally:
-        driver.quit()
+        if pool is not None:
+            pool.release(driver, headless=headless)
+        else:
+            driver.quit()
+
+
+async def fetch_google_serp_html_http(
+    query: str,
+    *,
+    timeout: int = DEFAULT_TIMEOUT,
+) -> tuple[bytes, Optional[str]]:
+    """Descarga la SERP por HTTP directo, sin lanzar un navegador.
+
+    Mucho mas rapido y ligero que Selenium; no ejecuta JavaScript, por lo
+    que las funciones de la SERP que dependen de JS requieren --use-browser.
+    Devuelve los bytes crudos y el charset declarado en la cabecera
+    Content-Type (None si no se declara).
+    """
+    cookies = httpx.Cookies()
+    cookies.set("CONSENT", "YES+cb", domain=".google.com")
+    url = f"https://www.google.com/search?q={quote_plus(query)}&hl=es&gl=es"
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=HTTP_HEADERS,
+        cookies=cookies,
+        timeout=timeout,
+        follow_redirects=True,
+    ) as client:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content, response.charset_encoding
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
@@ -208,6 +596,11 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         nargs="?",
         help="Consulta a buscar (por ejemplo: 'mejores hoteles la coruna').",
     )
+    parser.add_argument(
+        "--queries-file",
+        type=Path,
+        help="Archivo con una consulta por linea; se procesan en paralelo.",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -240,6 +633,33 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         default=800,
         help="Limite de tokens que puede generar el modelo (default: 800).",
     )
+    parser.add_argument(
+        "--max-input-chars",
+        type=int,
+        default=12000,
+        help="Caracteres maximos de SERP enviados al LLM (default: 12000).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Emite el resumen por stdout segun lo genera el modelo.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        help="Desactiva la cache local de resumenes del LLM.",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Segundos de validez de una entrada en cache (sin limite si se omite).",
+    )
+    parser.add_argument(
+        "--use-browser",
+        action="store_true",
+        help="Usa Selenium/Chrome en lugar de la descarga HTTP directa.",
+    )
     headless_group = parser.add_mutually_exclusive_group()
     headless_group.add_argument(
         "--headless",
@@ -263,43 +683,112 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     return parser.parse_args(argv)
 
 
-def main(argv: Optional[list[str]] = None) -> int:
-    args = parse_args(argv)
+def _numbered_path(path: Optional[Path], index: Optional[int]) -> Optional[Path]:
+    """En modo batch, deriva rutas por consulta a partir de la ruta base."""
+    if path is None or index is None:
+        return path
+    return path.with_name(f"{path.stem}-{index}{path.suffix}")
 
-    query = args.query or input("Que quieres buscar en Google? ").strip()
-    if not query:
-        print("La consulta no puede estar vacia.", file=sys.stderr)
-        return 1
 
-    html = fetch_google_serp_html(
-        query,
-        headless=args.headless,
-        timeout=args.timeout,
-    )
+async def process_query(
+    query: str,
+    args: argparse.Namespace,
+    index: Optional[int] = None,
+) -> None:
+    encoding: Optional[str] = None
+    if args.use_browser:
+        html = await asyncio.to_thread(
+            fetch_google_serp_html,
+            query,
+            headless=args.headless,
+            timeout=args.timeout,
+            pool=_DRIVER_POOL,
+        )
+    else:
+        html, encoding = await fetch_google_serp_html_http(
+            query, timeout=args.timeout
+        )
 
-    if args.output:
-        args.output.write_text(html, encoding="utf-8")
-        print(f"HTML guardado en {args.output}")
+    raw = html if isinstance(html, bytes) else html.encode("utf-8")
+    output = _numbered_path(args.output, index)
+    if output:
+        output.write_bytes(raw)
+        print(f"HTML guardado en {output}")
     else:
-        sys.stdout.write(html)
+        sys.stdout.buffer.write(raw)
 
     if args.objective:
-        text_content = extract_text_from_html(html)
-        summary = summarize_text_with_llm(
+        text_content = extract_text_from_html(html, encoding=encoding)
+        summary_output = _numbered_path(args.summary_output, index)
+        # En modo batch (index fijado) varias tareas comparten stdout y
+        # los deltas se entremezclarian: el streaming solo aplica a la
+        # consulta unica con resumen por stdout.
+        stream = args.stream and summary_output is None and index is None
+        if stream:
+            print(f"\n--- Resumen generado por el LLM ({query}) ---\n")
+        summary = await summarize_text_with_llm(
             text_content,
             args.objective,
             model=args.model,
             temperature=args.temperature,
             max_output_tokens=args.max_output_tokens,
+            use_cache=args.use_cache,
+            cache_ttl=args.cache_ttl,
+            max_input_chars=args.max_input_chars,
+            stream=stream,
         )
-        if args.summary_output:
-            args.summary_output.write_text(summary, encoding="utf-8")
-            print(f"Resumen guardado en {args.summary_output}")
+        if summary_output:
+            summary_output.write_bytes(summary.encode("utf-8"))
+            print(f"Resumen guardado en {summary_output}")
+        elif stream:
+            print()
         else:
-            print("\n--- Resumen generado por el LLM ---\n")
+            print(f"\n--- Resumen generado por el LLM ({query}) ---\n")
             print(summary)
 
-    return 0
+
+async def main_async(queries: list[str], args: argparse.Namespace) -> int:
+    if len(queries) == 1:
+        await process_query(queries[0], args)
+        return 0
+
+    # Solapa la espera de red de unas consultas con el trabajo de otras:
+    # mientras un resumen espera a la API, otra SERP se esta descargando.
+    # return_exceptions aisla los fallos por consulta (p. ej. un 429 de
+    # Google): una consulta mala no tira el resto del batch.
+    results = await asyncio.gather(
+        *(
+            process_query(query, args, index)
+            for index, query in enumerate(queries, start=1)
+        ),
+        return_exceptions=True,
+    )
+    failures = 0
+    for query, result in zip(queries, results):
+        if isinstance(result, BaseException):
+            failures += 1
+            print(f"Error procesando '{query}': {result}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+
+    if args.queries_file:
+        queries = [
+            line.strip()
+            for line in args.queries_file.read_text(encoding="utf-8").splitlines()
+            if line.strip()
+        ]
+    else:
+        query = args.query or input("Que quieres buscar en Google? ").strip()
+        queries = [query] if query else []
+
+    if not queries:
+        print("La consulta no puede estar vacia.", file=sys.stderr)
+        return 1
+
+    return asyncio.run(main_async(queries, args))
 
 
 if __name__ == "__main__":